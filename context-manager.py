@@ -1,3 +1,7 @@
+import bisect
+import math
+import time
+
 class ContextNode:
     def __init__(self, content, metadata=None):
         self.content = content
@@ -7,19 +11,73 @@ class ContextNode:
         self.confidence_score = 1.0  # Default full confidence
         self.references = []  # Source references if any
         
+class TemporalIndex:
+    """Time-ordered index of identifiers keyed by epoch seconds."""
+    def __init__(self):
+        self.positions = []  # Sorted epoch offsets
+        self.identifiers = []  # Identifier at the matching offset
+        
+    def __len__(self):
+        return len(self.positions)
+        
+    def add(self, identifier, position):
+        """Insert an identifier; appending in time order is O(1)."""
+        index = bisect.bisect_right(self.positions, position)
+        self.positions.insert(index, position)
+        self.identifiers.insert(index, identifier)
+        
+    def remove(self, identifier, position):
+        """Remove an identifier previously added at the given position."""
+        index = bisect.bisect_left(self.positions, position)
+        while index < len(self.positions) and self.positions[index] == position:
+            if self.identifiers[index] == identifier:
+                del self.positions[index]
+                del self.identifiers[index]
+                return
+            index += 1
+            
+    def range(self, start=None, end=None):
+        """Return identifiers with start <= position <= end in O(log n + k)."""
+        low = 0 if start is None else bisect.bisect_left(self.positions, start)
+        high = len(self.positions) if end is None else bisect.bisect_right(self.positions, end)
+        return list(zip(self.identifiers[low:high], self.positions[low:high]))
+        
 class ContextGraph:
     def __init__(self):
         self.nodes = {}
         self.current_context = []
         self.context_history = []
         self.relationship_types = set()
+        self.temporal_index = TemporalIndex()
         
-    def add_node(self, identifier, content, metadata=None):
-        """Add a new context node to the graph."""
+    def add_node(self, identifier, content, metadata=None, timestamp=None):
+        """Add a new context node to the graph, indexed by creation time."""
+        if identifier in self.nodes:
+            previous = self.nodes[identifier]
+            self.temporal_index.remove(identifier, previous.temporal_position)
         node = ContextNode(content, metadata)
+        node.temporal_position = time.time() if timestamp is None else timestamp
         self.nodes[identifier] = node
+        self.temporal_index.add(identifier, node.temporal_position)
         return node
         
+    def remove_node(self, identifier):
+        """Remove a context node, its temporal index entry and links to it."""
+        node = self.nodes.pop(identifier, None)
+        if node is not None:
+            self.temporal_index.remove(identifier, node.temporal_position)
+            self.current_context = [n for n in self.current_context if n != identifier]
+            for other in self.nodes.values():
+                for relationship_type, target in list(other.relationships.items()):
+                    if target is node:
+                        del other.relationships[relationship_type]
+        return node
+        
+    def evict_oldest(self, limit):
+        """Remove the oldest nodes until at most `limit` remain."""
+        while len(self.temporal_index) > limit:
+            self.remove_node(self.temporal_index.identifiers[0])
+            
     def link_nodes(self, source_id, target_id, relationship_type):
         """Create a relationship between two context nodes."""
         if source_id in self.nodes and target_id in self.nodes:
@@ -39,15 +97,42 @@ class ContextGraph:
             self.context_history.append(('pop', removed))
             return removed
             
-    def get_relevant_context(self, query, threshold=0.5):
+    def get_nodes_in_range(self, start=None, end=None):
+        """Return (node_id, temporal_position) pairs created within [start, end]."""
+        return self.temporal_index.range(start, end)
+        
+    def get_recent_nodes(self, minutes, now=None):
+        """Return (node_id, temporal_position) pairs from the last N minutes."""
+        now = time.time() if now is None else now
+        return self.temporal_index.range(now - minutes * 60, now)
+        
+    def get_relevant_context(self, query, threshold=0.5, half_life=None, now=None):
         """
         Retrieve context nodes relevant to a given query.
         Uses simple similarity scoring for demonstration.
+        
+        With half_life (seconds), scores decay by 0.5 ** (age / half_life).
+        Since similarity is at most 1, nodes older than
+        half_life * log2(1 / threshold) can never pass the threshold, so
+        only the newer slice of the temporal index is scanned.
         """
+        if half_life is not None and not half_life > 0:
+            raise ValueError(f"half_life must be positive: {half_life}")
+        if half_life is None:
+            candidates = self.nodes.keys()
+        else:
+            now = time.time() if now is None else now
+            start = now - half_life * math.log2(1 / threshold) if threshold > 0 else None
+            candidates = [node_id for node_id, _ in self.temporal_index.range(start)]
+            
         relevant_nodes = []
-        for node_id, node in self.nodes.items():
+        for node_id in candidates:
+            node = self.nodes[node_id]
             # This would be replaced with proper similarity scoring
             similarity = self._calculate_similarity(query, node.content)
+            if half_life is not None:
+                age = max(0.0, now - node.temporal_position)
+                similarity *= 0.5 ** (age / half_life)
             if similarity > threshold:
                 relevant_nodes.append((node_id, similarity))
         return sorted(relevant_nodes, key=lambda x: x[1], reverse=True)
@@ -6,7 +6,8 @@ USER: biblicalandr0id
 """
 
 class CompleteContext:
-    def __init__(self):
+    def __init__(self, history_limit=None):
+        self.history_limit = history_limit  # Max topics/decisions kept (None keeps all)
         self.state = {
             'time': '2025-02-14 11:58:27',
             'user': 'biblicalandr0id',
@@ -48,6 +49,10 @@ class CompleteContext:
             self.state['active']['goal'] = goal
             self.state['memory']['decisions'].append(goal)
 
+        if self.history_limit is not None:
+            for chain in ('topics', 'decisions'):
+                del self.state['memory'][chain][:-self.history_limit or None]
+
     def get(self) -> dict:
         """Single efficient getter"""
         return self.state
@@ -7,9 +7,10 @@ STATE: Active Learning
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Set, Any
-from datetime import datetime
+from typing import Dict, List, Set, Any, Optional
+from datetime import datetime, timedelta, timezone
 import asyncio
+import bisect
 import hashlib
 
 @dataclass
@@ -34,6 +35,23 @@ class Brain:
         'style_markers': set()
     })
     
+    # Keep only the newest N topics (None keeps all)
+    topic_limit: Optional[int] = None
+    
+    # Epoch offsets of dna['topics'], kept sorted for range queries
+    topic_index: List[float] = field(default_factory=list, init=False)
+    
+    def __post_init__(self):
+        """Index any topics passed in, sorting them by timestamp"""
+        topics = self.dna['topics']
+        offsets = [
+            self._epoch_offset(datetime.fromisoformat(topic['timestamp']))
+            for topic in topics
+        ]
+        order = sorted(range(len(offsets)), key=offsets.__getitem__)
+        self.dna = {**self.dna, 'topics': [topics[i] for i in order]}
+        self.topic_index = [offsets[i] for i in order]
+        
     def evolve(self, message: str) -> None:
         """Learn from each interaction"""
         # Add new patterns
@@ -43,15 +61,41 @@ class Brain:
             self.dna['patterns'].add('values_power')
             
         # Track topics
-        self.dna['topics'].append({
-            'timestamp': datetime.utcnow().isoformat(),
+        now = datetime.utcnow()
+        offset = self._epoch_offset(now)
+        position = bisect.bisect_right(self.topic_index, offset)
+        self.topic_index.insert(position, offset)
+        self.dna['topics'].insert(position, {
+            'timestamp': now.isoformat(),
             'focus': self._extract_focus(message)
         })
+        if self.topic_limit is not None and len(self.topic_index) > self.topic_limit:
+            excess = len(self.topic_index) - self.topic_limit
+            del self.topic_index[:excess]
+            del self.dna['topics'][:excess]
         
         # Update style markers
         if any(word in message.lower() for word in ['direct', 'practical', 'grounded']):
             self.dna['style_markers'].add('values_clarity')
             
+    @staticmethod
+    def _epoch_offset(moment: datetime) -> float:
+        """Seconds since the epoch; aware datetimes are converted to UTC"""
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+        return (moment - datetime(1970, 1, 1)).total_seconds()
+
+    def get_topics_between(self, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        """Topics tracked within [start, end] (naive UTC)"""
+        low = bisect.bisect_left(self.topic_index, self._epoch_offset(start))
+        high = bisect.bisect_right(self.topic_index, self._epoch_offset(end))
+        return self.dna['topics'][low:high]
+
+    def get_recent_topics(self, minutes: float) -> List[Dict[str, Any]]:
+        """Topics tracked in the last N minutes"""
+        now = datetime.utcnow()
+        return self.get_topics_between(now - timedelta(minutes=minutes), now)
+
     @staticmethod
     def _extract_focus(message: str) -> str:
         """Extract main focus from message"""
@@ -10,7 +10,7 @@ Track and enforce the complete state of the system itself.
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, Set, List, Optional, Any
+from typing import Dict, Set, List, Optional, Any, Tuple
 from datetime import datetime
 import hashlib
 import asyncio
@@ -25,13 +25,38 @@ class SystemState:
     system_hash: str
     locked: bool = False
 
+@dataclass
+class StateCheckpoint:
+    index: int
+    size: int
+    merkle_root: str
+    timestamp: datetime
+
+@dataclass
+class StateProof:
+    index: int
+    size: int
+    leaf_hash: str
+    path: List[str]
+    peaks: List[str]
+    peak_index: int
+
 class StateEngine:
-    def __init__(self):
+    def __init__(self, checkpoint_interval: int = 1024):
+        if checkpoint_interval < 1:
+            raise ValueError(f"Invalid checkpoint interval: {checkpoint_interval}")
         self._states: List[SystemState] = []
+        self._state_offset: int = 0
         self._current_commands: List[str] = []
         self._verification_active: bool = False
         self._lock = asyncio.Lock()
         self._logger = logging.getLogger('StateEngine')
+
+        # Merkle accumulator over every state ever appended; keeps all ~2n hashes
+        # so old states stay provable after their SystemState is compacted
+        self._merkle_levels: List[List[str]] = [[]]
+        self._checkpoints: List[StateCheckpoint] = []
+        self._checkpoint_interval = checkpoint_interval
         
         # Initialize first state
         self._initialize_state()
@@ -45,7 +70,86 @@ class StateEngine:
             verification_state=True,
             system_hash=self._generate_hash([])
         )
-        self._states.append(initial_state)
+        self._append_state(initial_state)
+
+    def _append_state(self, state: SystemState) -> None:
+        """Append state to history and Merkle accumulator, checkpointing periodically."""
+        self._states.append(state)
+
+        # Carry the new leaf upward while it completes a pair: O(log n) worst, O(1) amortized
+        node = self._merkle_leaf(state)
+        position = len(self._merkle_levels[0])
+        level = 0
+        self._merkle_levels[0].append(node)
+        while position & 1:
+            if level + 1 == len(self._merkle_levels):
+                self._merkle_levels.append([])
+            node = self._merkle_node(self._merkle_levels[level][position - 1], node)
+            position >>= 1
+            level += 1
+            self._merkle_levels[level].append(node)
+
+        if self.get_state_count() % self._checkpoint_interval == 0:
+            self._create_checkpoint()
+
+    def _create_checkpoint(self) -> None:
+        """Record current Merkle root and drop SystemState objects behind it.
+
+        Accumulator hashes are kept (O(n)); chain verification then covers
+        only the retained tail, anchored to this checkpoint's root.
+        """
+        size = self.get_state_count()
+        checkpoint = StateCheckpoint(
+            index=len(self._checkpoints),
+            size=size,
+            merkle_root=self.get_merkle_root(),
+            timestamp=datetime.utcnow()
+        )
+        self._checkpoints.append(checkpoint)
+
+        # Keep only the latest state so transitions can still be verified
+        compacted = len(self._states) - 1
+        del self._states[:compacted]
+        self._state_offset += compacted
+        self._logger.info(f"Checkpoint {checkpoint.index} at {size} states: {checkpoint.merkle_root}")
+
+    @staticmethod
+    def _merkle_leaf(state: SystemState) -> str:
+        """Hash a state into a Merkle leaf."""
+        data = (f"{state.timestamp.isoformat()}:{state.executor}:{state.command_stack}:"
+                f"{state.verification_state}:{state.system_hash}:{state.locked}")
+        return hashlib.sha256(b'\x00' + data.encode()).hexdigest()
+
+    @staticmethod
+    def _merkle_node(left: str, right: str) -> str:
+        """Hash two child nodes into their parent."""
+        return hashlib.sha256(b'\x01' + f"{left}{right}".encode()).hexdigest()
+
+    @staticmethod
+    def _bag_peaks(peaks: List[str]) -> str:
+        """Fold mountain peaks (highest first) into a single root."""
+        root = peaks[-1]
+        for peak in reversed(peaks[:-1]):
+            root = StateEngine._merkle_node(peak, root)
+        return root
+
+    @staticmethod
+    def _proof_shape(index: int, size: int) -> Tuple[int, int]:
+        """Get (path length, peak index) for leaf `index` in a tree of `size` leaves."""
+        # Climb until the node has no sibling within `size`: that node is a peak
+        level = 0
+        while (index >> level) ^ 1 < size >> level:
+            level += 1
+        # Peaks are ordered highest first; count those above our level
+        return level, bin(size >> (level + 1)).count('1')
+
+    def _get_peaks(self, size: int) -> List[str]:
+        """Get accumulator peaks for the first `size` states, highest first."""
+        return [
+            self._merkle_levels[level][(size >> level) - 1]
+            for level in reversed(range(size.bit_length()))
+            if (size >> level) & 1
+        ]
 
     def _generate_hash(self, commands: List[str]) -> str:
         """Generate deterministic hash of current state."""
@@ -70,7 +174,7 @@ class StateEngine:
 
                 # Verify state transition
                 if await self._verify_transition(new_state):
-                    self._states.append(new_state)
+                    self._append_state(new_state)
                     self._logger.info(f"State transition successful: {new_state.system_hash}")
                     return True
                 else:
@@ -111,7 +215,18 @@ class StateEngine:
         return True
 
     async def _verify_state_chain(self) -> bool:
-        """Verify integrity of entire state chain."""
+        """Verify retained state chain, anchored to the last checkpoint root."""
+        for i, state in enumerate(self._states):
+            if self._merkle_leaf(state) != self._merkle_levels[0][self._state_offset + i]:
+                return False
+
+        if self._checkpoints:
+            # The oldest retained state is the last one the checkpoint covers
+            checkpoint = self._checkpoints[-1]
+            proof = self.prove(checkpoint.size - 1, checkpoint.size)
+            if not self.verify_proof(proof, checkpoint.merkle_root, self._states[0]):
+                return False
+
         for i in range(len(self._states) - 1):
             if not await self._verify_transition(self._states[i + 1], self._states[i]):
                 return False
@@ -149,9 +264,75 @@ class StateEngine:
         return self._states[-1]
 
     def get_state_history(self) -> List[SystemState]:
-        """Get complete state history."""
+        """Get state history retained since the last checkpoint."""
         return self._states.copy()
 
+    def get_state_count(self) -> int:
+        """Get total number of states, including compacted ones."""
+        return self._state_offset + len(self._states)
+
+    def get_checkpoints(self) -> List[StateCheckpoint]:
+        """Get all recorded checkpoints."""
+        return self._checkpoints.copy()
+
+    def get_merkle_root(self, size: Optional[int] = None) -> str:
+        """Get Merkle root over the first `size` states (default: all)."""
+        size = self.get_state_count() if size is None else size
+        if not 0 < size <= self.get_state_count():
+            raise ValueError(f"Invalid accumulator size: {size}")
+        return self._bag_peaks(self._get_peaks(size))
+
+    def prove(self, index: int, size: Optional[int] = None) -> StateProof:
+        """Build an O(log n) inclusion proof for state `index` against root of `size` states."""
+        size = self.get_state_count() if size is None else size
+        if not 0 < size <= self.get_state_count():
+            raise ValueError(f"Invalid accumulator size: {size}")
+        if not 0 <= index < size:
+            raise IndexError(f"State index out of range: {index}")
+
+        height, peak_index = self._proof_shape(index, size)
+        path = [
+            self._merkle_levels[level][(index >> level) ^ 1]
+            for level in range(height)
+        ]
+
+        return StateProof(
+            index=index,
+            size=size,
+            leaf_hash=self._merkle_levels[0][index],
+            path=path,
+            peaks=self._get_peaks(size),
+            peak_index=peak_index
+        )
+
+    @staticmethod
+    def verify_proof(proof: StateProof, merkle_root: str,
+                     state: Optional[SystemState] = None) -> bool:
+        """Verify an inclusion proof against a trusted root without the state history."""
+        if state is not None and StateEngine._merkle_leaf(state) != proof.leaf_hash:
+            return False
+
+        # Path length, sides and peak all follow from index and size
+        if not 0 <= proof.index < proof.size:
+            return False
+        height, peak_index = StateEngine._proof_shape(proof.index, proof.size)
+        if len(proof.path) != height or proof.peak_index != peak_index:
+            return False
+        if len(proof.peaks) != bin(proof.size).count('1'):
+            return False
+
+        node = proof.leaf_hash
+        for level, sibling in enumerate(proof.path):
+            if (proof.index >> level) & 1:
+                node = StateEngine._merkle_node(sibling, node)
+            else:
+                node = StateEngine._merkle_node(node, sibling)
+
+        if node != proof.peaks[proof.peak_index]:
+            return False
+
+        return StateEngine._bag_peaks(proof.peaks) == merkle_root
+
 # Initialize state engine
 engine = StateEngine()
 
@@ -0,0 +1,77 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+_spec = importlib.util.spec_from_file_location(
+    "context_manager", Path(__file__).resolve().parent.parent / "context-manager.py"
+)
+context_manager = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(context_manager)
+ContextGraph = context_manager.ContextGraph
+
+
+def test_remove_node_drops_links_to_it():
+    graph = ContextGraph()
+    graph.add_node('a', 'alpha', timestamp=1.0)
+    graph.add_node('b', 'beta', timestamp=2.0)
+    graph.add_node('c', 'gamma', timestamp=3.0)
+    graph.link_nodes('b', 'a', 'follows')
+    graph.link_nodes('c', 'b', 'follows')
+    graph.push_context('a')
+
+    graph.evict_oldest(2)
+
+    assert set(graph.nodes) == {'b', 'c'}
+    assert graph.nodes['b'].relationships == {}
+    assert graph.nodes['c'].relationships['follows'] is graph.nodes['b']
+    assert graph.current_context == []
+    assert graph.get_nodes_in_range() == [('b', 2.0), ('c', 3.0)]
+
+
+def test_range_queries_are_inclusive():
+    graph = ContextGraph()
+    for i in range(5):
+        graph.add_node(f"n{i}", "text", timestamp=float(i * 10))
+
+    assert graph.get_nodes_in_range(10.0, 30.0) == [('n1', 10.0), ('n2', 20.0), ('n3', 30.0)]
+    assert graph.get_nodes_in_range(11.0, 29.0) == [('n2', 20.0)]
+    assert graph.get_recent_nodes(0.5, now=40.0) == [('n1', 10.0), ('n2', 20.0), ('n3', 30.0), ('n4', 40.0)]
+
+
+def test_readding_node_moves_index_entry():
+    graph = ContextGraph()
+    graph.add_node('a', 'first', timestamp=1.0)
+    graph.add_node('b', 'second', timestamp=2.0)
+    graph.add_node('a', 'again', timestamp=3.0)
+
+    assert graph.get_nodes_in_range() == [('b', 2.0), ('a', 3.0)]
+    assert len(graph.temporal_index) == len(graph.nodes) == 2
+
+
+def test_decay_cutoff_matches_full_scan():
+    graph = ContextGraph()
+    now = 10000.0
+    for i in range(200):
+        content = "neural networks explained" if i % 3 else "neural networks"
+        graph.add_node(f"n{i}", content, timestamp=now - i * 7.0)
+
+    query, threshold, half_life = "neural networks explained", 0.3, 120.0
+    expected = []
+    for node_id, node in graph.nodes.items():
+        score = graph._calculate_similarity(query, node.content)
+        score *= 0.5 ** ((now - node.temporal_position) / half_life)
+        if score > threshold:
+            expected.append((node_id, score))
+    expected.sort(key=lambda x: x[1], reverse=True)
+
+    assert expected
+    assert graph.get_relevant_context(query, threshold, half_life=half_life, now=now) == expected
+
+
+def test_half_life_must_be_positive():
+    graph = ContextGraph()
+    graph.add_node('a', 'text', timestamp=5.0)
+    for half_life in (0, -10.0):
+        with pytest.raises(ValueError):
+            graph.get_relevant_context('text', half_life=half_life, now=5.0)
@@ -0,0 +1,49 @@
+import importlib.util
+from datetime import datetime, timedelta
+from pathlib import Path
+
+_spec = importlib.util.spec_from_file_location(
+    "core_conversation_brain", Path(__file__).resolve().parent.parent / "core_conversation_brain.py"
+)
+core_conversation_brain = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(core_conversation_brain)
+Brain = core_conversation_brain.Brain
+
+
+def test_existing_topics_are_indexed():
+    now = datetime.utcnow()
+    topics = [
+        {'timestamp': (now - timedelta(minutes=minutes)).isoformat(), 'focus': f"focus_{minutes}"}
+        for minutes in (5, 120, 30)
+    ]
+    brain = Brain(dna={'patterns': set(), 'topics': topics, 'interests': set(), 'style_markers': set()})
+
+    assert [t['focus'] for t in brain.dna['topics']] == ['focus_120', 'focus_30', 'focus_5']
+    assert [t['focus'] for t in brain.get_recent_topics(60)] == ['focus_30', 'focus_5']
+
+    brain.evolve("context please")
+    assert [t['focus'] for t in brain.get_recent_topics(10)] == ['focus_5', 'context_management']
+
+
+def test_topic_limit_keeps_index_aligned():
+    brain = Brain(topic_limit=2)
+    for message in ("context", "system", "conversation"):
+        brain.evolve(message)
+
+    assert len(brain.topic_index) == 2
+    assert [t['focus'] for t in brain.get_recent_topics(1)] == ['system_design', 'conversation_flow']
+
+
+def test_aware_timestamps_and_caller_list_untouched():
+    topics = [
+        {'timestamp': '2026-01-01T02:00:00+02:00', 'focus': 'second'},
+        {'timestamp': '2026-01-01T00:30:00+00:00', 'focus': 'third'},
+        {'timestamp': '2025-12-31T23:00:00', 'focus': 'first'},
+    ]
+    original = list(topics)
+    brain = Brain(dna={'patterns': set(), 'topics': topics, 'interests': set(), 'style_markers': set()})
+
+    assert topics == original
+    assert [t['focus'] for t in brain.dna['topics']] == ['first', 'second', 'third']
+    window = brain.get_topics_between(datetime(2026, 1, 1), datetime(2026, 1, 1, 0, 30))
+    assert [t['focus'] for t in window] == ['second', 'third']
@@ -0,0 +1,134 @@
+import asyncio
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+_root = Path(__file__).resolve().parent.parent
+
+
+def load(name, filename):
+    spec = importlib.util.spec_from_file_location(name, _root / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+core_pipeline = load("core_pipeline", "core_pipeline.py")
+Pipeline = core_pipeline.Pipeline
+Stage = core_pipeline.Stage
+StageFailure = core_pipeline.StageFailure
+
+
+def run(pipeline, items):
+    async def main():
+        await pipeline.start()
+
+        async def produce():
+            for item in items:
+                await pipeline.submit(item)
+            pipeline.close()
+
+        producer = asyncio.create_task(produce())
+        results = [result async for result in pipeline.results()]
+        await producer
+        await pipeline.wait_closed()
+        return results
+
+    return asyncio.run(main())
+
+
+def test_every_item_is_accounted_for():
+    def batch_handler(batch):
+        if 10 in batch:
+            raise RuntimeError("boom")
+        return batch
+
+    pipeline = Pipeline()
+    pipeline.add_stage(Stage('batch', batch_handler, batched=True, batch_size=8, batch_timeout=0.01))
+    pipeline.add_stage(Stage('invert', lambda x: 1 / x, concurrency=2))
+    results = run(pipeline, range(100))
+
+    failures = [r for r in results if isinstance(r, StageFailure)]
+    assert len(results) == 100
+    assert ('invert', 0) in {(f.stage, f.item) for f in failures}
+    assert 10 in {f.item for f in failures if f.stage == 'batch'}
+    assert pipeline.get_metrics()['failed'] == len(failures)
+
+
+def test_short_batch_output_fails_whole_batch():
+    pipeline = Pipeline()
+    pipeline.add_stage(Stage('short', lambda b: b[:-1], batched=True, batch_size=8, batch_timeout=0.05))
+    results = run(pipeline, range(8))
+
+    assert len(results) == 8
+    assert all(isinstance(r, StageFailure) for r in results)
+    assert pipeline.get_metrics()['completed'] == 0
+
+
+def test_close_then_read_does_not_deadlock():
+    async def main():
+        pipeline = Pipeline(output_size=4)
+        pipeline.add_stage(Stage('double', lambda x: x * 2))
+        await pipeline.start()
+        for item in range(10):
+            await pipeline.submit(item)
+        pipeline.close()
+        results = await asyncio.wait_for(_collect(pipeline), timeout=2)
+        await asyncio.wait_for(pipeline.wait_closed(), timeout=2)
+        return results
+
+    assert sorted(asyncio.run(main())) == [x * 2 for x in range(10)]
+
+
+async def _collect(pipeline):
+    return [result async for result in pipeline.results()]
+
+
+def test_submit_blocks_when_output_is_not_drained():
+    async def main():
+        pipeline = Pipeline(output_size=1)
+        pipeline.add_stage(Stage('identity', lambda x: x, queue_size=1))
+        await pipeline.start()
+
+        async def flood():
+            for item in range(10):
+                await pipeline.submit(item)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(flood(), timeout=0.2)
+        return pipeline.get_metrics()
+
+    metrics = asyncio.run(main())
+    assert metrics['completed'] <= 3
+
+
+def test_conversation_pipeline_end_to_end():
+    brain_module = load("core_conversation_brain", "core_conversation_brain.py")
+    context_module = load("core_complete_context", "core_complete_context (1).py")
+    state_module = load("core_state_engine", "core_state_engine (1).py")
+    graph_module = load("context_manager", "context-manager.py")
+
+    class StubController:
+        async def process_message(self, message):
+            return {'message': message}
+
+    limit = 8
+    brain = brain_module.Brain(topic_limit=limit)
+    context = context_module.CompleteContext(history_limit=limit)
+    graph = graph_module.ContextGraph()
+    pipeline = core_pipeline.build_conversation_pipeline(
+        brain, StubController(), context, state_module.StateEngine(), graph, graph_limit=limit
+    )
+    messages = [f"expand the context system {i}" for i in range(50)]
+    results = asyncio.run(core_pipeline.process_messages(pipeline, messages))
+
+    assert len(results) == 50
+    assert not any(isinstance(r, StageFailure) for r in results)
+    for envelope in results:
+        assert set(envelope) == {'id', 'message', 'brain', 'conversation', 'context', 'state', 'graph'}
+    assert len({id(envelope['context']) for envelope in results}) == 50
+    assert len(brain.dna['topics']) <= limit
+    assert len(context.state['memory']['topics']) <= limit
+    assert len(context.state['memory']['decisions']) <= limit
+    assert len(graph.nodes) <= limit
@@ -0,0 +1,70 @@
+import asyncio
+import dataclasses
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+_spec = importlib.util.spec_from_file_location(
+    "core_state_engine", Path(__file__).resolve().parent.parent / "core_state_engine (1).py"
+)
+core_state_engine = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(core_state_engine)
+StateEngine = core_state_engine.StateEngine
+
+
+def build_engine(count, checkpoint_interval=1024):
+    engine = StateEngine(checkpoint_interval=checkpoint_interval)
+    base = engine.get_current_state()
+    for i in range(count - 1):
+        engine._append_state(dataclasses.replace(base, command_stack=[str(i)]))
+    return engine
+
+
+def test_proofs_verify_for_every_index_and_size():
+    engine = build_engine(40, checkpoint_interval=7)
+    for size in range(1, 41):
+        root = engine.get_merkle_root(size)
+        for index in range(size):
+            assert StateEngine.verify_proof(engine.prove(index, size), root)
+
+
+def test_proof_checks_state():
+    engine = build_engine(12)
+    root = engine.get_merkle_root()
+    state = engine.get_current_state()
+    assert StateEngine.verify_proof(engine.prove(11), root, state)
+    assert not StateEngine.verify_proof(engine.prove(10), root, state)
+
+
+def test_proof_rejects_relabelled_index():
+    engine = build_engine(12)
+    root = engine.get_merkle_root()
+    forged = dataclasses.replace(engine.prove(3), index=9)
+    assert not StateEngine.verify_proof(forged, root)
+
+
+def test_proof_rejects_internal_node_as_leaf():
+    engine = build_engine(12)
+    root = engine.get_merkle_root()
+    proof = engine.prove(0)
+    forged = dataclasses.replace(
+        proof, index=7, leaf_hash=engine._merkle_levels[1][0], path=proof.path[1:]
+    )
+    assert not StateEngine.verify_proof(forged, root)
+
+
+def test_invalid_checkpoint_interval():
+    with pytest.raises(ValueError):
+        StateEngine(checkpoint_interval=0)
+    with pytest.raises(ValueError):
+        StateEngine(checkpoint_interval=-3)
+
+
+def test_state_chain_anchored_to_checkpoint():
+    engine = build_engine(10, checkpoint_interval=5)
+    assert len(engine.get_checkpoints()) == 2
+    assert asyncio.run(engine._verify_state_chain())
+
+    engine._states[0].command_stack.append('tampered')
+    assert not asyncio.run(engine._verify_state_chain())